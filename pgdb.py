@@ -332,17 +332,23 @@ def decimal_type(decimal_type=None):
     return Decimal
 
 
+_true_values = frozenset('tT')
+
+
 def cast_bool(value):
     """Cast boolean value in database format to bool."""
     if value:
-        return value[0] in ('t', 'T')
+        return value[0] in _true_values
+
+
+_re_not_numeric = regex('[^0-9.-]')
 
 
 def cast_money(value):
     """Cast money value in database format to Decimal."""
     if value:
         value = value.replace('(', '-')
-        return Decimal(''.join(c for c in value if c.isdigit() or c in '.-'))
+        return Decimal(_re_not_numeric.sub('', value))
 
 
 def cast_int2vector(value):
@@ -761,6 +767,50 @@ class TypeCode(str):
 FieldInfo = namedtuple('FieldInfo', ('name', 'type'))
 
 
+# Type information for built-in PostgreSQL types having stable OIDs, used
+# for preloading type caches so that these do not need to be looked up in
+# the database: (oid, name, len, type, category, delim, relid)
+
+_builtin_types = (
+    (16, 'bool', 1, 'b', 'B', ',', 0),
+    (17, 'bytea', -1, 'b', 'U', ',', 0),
+    (20, 'int8', 8, 'b', 'N', ',', 0),
+    (21, 'int2', 2, 'b', 'N', ',', 0),
+    (23, 'int4', 4, 'b', 'N', ',', 0),
+    (25, 'text', -1, 'b', 'S', ',', 0),
+    (26, 'oid', 4, 'b', 'N', ',', 0),
+    (114, 'json', -1, 'b', 'U', ',', 0),
+    (700, 'float4', 4, 'b', 'N', ',', 0),
+    (701, 'float8', 8, 'b', 'N', ',', 0),
+    (790, 'money', 8, 'b', 'N', ',', 0),
+    (1042, 'bpchar', -1, 'b', 'S', ',', 0),
+    (1043, 'varchar', -1, 'b', 'S', ',', 0),
+    (1082, 'date', 4, 'b', 'D', ',', 0),
+    (1083, 'time', 8, 'b', 'D', ',', 0),
+    (1114, 'timestamp', 8, 'b', 'D', ',', 0),
+    (1184, 'timestamptz', 8, 'b', 'D', ',', 0),
+    (1186, 'interval', 16, 'b', 'T', ',', 0),
+    (1266, 'timetz', 12, 'b', 'D', ',', 0),
+    (1700, 'numeric', -1, 'b', 'N', ',', 0),
+    (2950, 'uuid', 16, 'b', 'U', ',', 0),
+    (1000, '_bool', -1, 'b', 'A', ',', 0),
+    (1001, '_bytea', -1, 'b', 'A', ',', 0),
+    (1005, '_int2', -1, 'b', 'A', ',', 0),
+    (1007, '_int4', -1, 'b', 'A', ',', 0),
+    (1009, '_text', -1, 'b', 'A', ',', 0),
+    (1014, '_bpchar', -1, 'b', 'A', ',', 0),
+    (1015, '_varchar', -1, 'b', 'A', ',', 0),
+    (1016, '_int8', -1, 'b', 'A', ',', 0),
+    (1021, '_float4', -1, 'b', 'A', ',', 0),
+    (1022, '_float8', -1, 'b', 'A', ',', 0),
+    (1231, '_numeric', -1, 'b', 'A', ',', 0))
+
+
+# Types found by their OIDs can be shared by all connections to the same
+# database, since OIDs do not depend on the session like type names do.
+_shared_types = {}
+
+
 class TypeCache(dict):
     """Cache for database types.
 
@@ -773,6 +823,8 @@ class TypeCache(dict):
         super(TypeCache, self).__init__()
         self._escape_string = cnx.escape_string
         self._src = cnx.source()
+        self._shared_types = _shared_types.setdefault(
+            (cnx.host, cnx.port, cnx.db), {})
         self._typecasts = LocalTypecasts()
         self._typecasts.get_fields = self.get_fields
         self._typecasts.connection = cnx
@@ -787,10 +839,18 @@ class TypeCache(dict):
                 "SELECT oid, typname,"
                 " typlen, typtype, typcategory, typdelim, typrelid"
                 " FROM pg_catalog.pg_type WHERE oid OPERATOR(pg_catalog.=) %s")
+            # preload the built-in types (type categories need PostgreSQL 8.4)
+            for type_info in _builtin_types:
+                type_code = TypeCode.create(*type_info)
+                self[type_code.oid] = self[str(type_code)] = type_code
 
     def __missing__(self, key):
         """Get the type info from the database if it is not cached."""
         if isinstance(key, int):
+            type_code = self._shared_types.get(key)
+            if type_code is not None:  # found by another connection
+                self[key] = self[str(type_code)] = type_code
+                return type_code
             oid = key
         else:
             if '.' not in key and '"' not in key:
@@ -804,12 +864,16 @@ class TypeCache(dict):
             res = self._src.fetch(1)
         if not res:
             raise KeyError('Type %s could not be found' % (key,))
-        res = res[0]
+        return self._add_type(res[0])
+
+    def _add_type(self, res):
+        """Add the type info from the given pg_type row to the cache."""
         type_code = TypeCode.create(
             int(res[0]), res[1], int(res[2]),
             res[3], res[4], res[5], int(res[6]))
         # noinspection PyUnresolvedReferences
         self[type_code.oid] = self[str(type_code)] = type_code
+        self._shared_types[type_code.oid] = type_code
         return type_code
 
     def get(self, key, default=None):
@@ -819,6 +883,23 @@ class TypeCache(dict):
         except KeyError:
             return default
 
+    def get_types(self, keys):
+        """Get the types for the given type OIDs or names.
+
+        All types given by OIDs that are not cached yet are looked up
+        in the database using a single query.
+        """
+        shared_types = self._shared_types
+        oids = set(key for key in keys if isinstance(key, int)
+                   and key not in self and key not in shared_types)
+        if len(oids) > 1:
+            oids = "ANY('{%s}'::pg_catalog.oid[])" % (
+                ','.join(map(str, oids)),)
+            self._src.execute(self._query_pg_type % (oids,))
+            for res in self._src.fetch(-1):
+                self._add_type(res)
+        return [self[key] for key in keys]
+
     def get_fields(self, typ):
         """Get the names and types of the fields of composite types."""
         if not isinstance(typ, TypeCode):
@@ -859,11 +940,18 @@ class TypeCache(dict):
             return value
         return cast(value)
 
-    def get_row_caster(self, types):
-        """Get a typecast function for a complete row of values."""
+    def get_column_casts(self, types):
+        """Get the typecast functions for the given column types.
+
+        Columns that do not need to be casted get None as typecast function.
+        """
         typecasts = self._typecasts
         casts = [typecasts[typ] for typ in types]
-        casts = [cast if cast is not str else None for cast in casts]
+        return [cast if cast is not str else None for cast in casts]
+
+    def get_row_caster(self, types):
+        """Get a typecast function for a complete row of values."""
+        casts = self.get_column_casts(types)
 
         def row_caster(row):
             return [value if cast is None or value is None else cast(value)
@@ -872,15 +960,122 @@ class TypeCache(dict):
         return row_caster
 
 
-class _quotedict(dict):
-    """Dictionary with auto quoting of its items.
+class _quotedview(object):
+    """Read-only view of a dictionary with auto quoting of its items.
 
-    The quote attribute must be set to the desired quote function.
+    This can be used as mapping for string formatting without copying
+    the dictionary, since this needs only item access.
     """
 
+    __slots__ = ('dict', 'quote')
+
+    def __init__(self, d, quote):
+        self.dict = d
+        self.quote = quote
+
     def __getitem__(self, key):
-        # noinspection PyUnresolvedReferences
-        return self.quote(super(_quotedict, self).__getitem__(key))
+        return self.quote(self.dict[key])
+
+
+# DML operations that can be run as prepared statements in executemany(),
+# provided they use only simple pyformat parameters and no string literals
+_re_preparable = regex(r'(?i)\s*(?:delete|insert|update)\b')
+_re_param = regex(r'%(?:\(([^)]*)\))?(.?)')
+
+
+def _prepare_operation(operation):
+    """Split an operation with pyformat parameters for preparing it.
+
+    Returns the parts of the operation between the parameters, the indices
+    of the parameters between these parts and the list of parameter names
+    (None for positional parameters), or None if this is not possible.
+    """
+    if not _re_preparable.match(operation):
+        return None
+    if "'" in operation or '$' in operation:
+        return None  # there could be parameters inside literals
+    if '--' in operation or '/*' in operation:
+        return None  # there could be parameters inside comments
+    if ';' in operation.rstrip().rstrip(';'):
+        return None  # multiple statements cannot be prepared
+    parts, indices, names = [], [], []
+    positions = {}
+    part = []
+    start = 0
+    for match in _re_param.finditer(operation):
+        name, conversion = match.groups()
+        part.append(operation[start:match.start()])
+        start = match.end()
+        if conversion == '%' and name is None:
+            part.append('%')
+            continue
+        if conversion != 's':
+            return None
+        if name is None:
+            index = len(names)
+            names.append(None)
+        else:
+            index = positions.get(name)
+            if index is None:
+                index = positions[name] = len(names)
+                names.append(name)
+        parts.append(''.join(part))
+        indices.append(index)
+        part = []
+    part.append(operation[start:])
+    parts.append(''.join(part))
+    if not names or (positions and len(positions) != len(names)):
+        return None  # no parameters or mixed positional and named ones
+    return parts, indices, names
+
+
+# separator for escaping many strings at once, consisting of distinct
+# control characters that are not changed by escaping (it must not
+# contain null characters, because these terminate the escaped string)
+_escape_separator = '\x01\x02\x03'
+
+
+# SQL types of values that can be passed as parameters to prepared
+# statements, which are the same as the types of the quoted values
+_param_types = {
+    bool: 'bool', StdDecimal: 'numeric', date: 'date',
+    timedelta: 'interval', Uuid: 'uuid'}
+
+# SQL types that can be widened when passing parameters of different types
+_numeric_param_types = ('int4', 'int8', 'numeric')
+
+
+def _get_param_type(value):
+    """Get the SQL type of a value passed to a prepared statement.
+
+    This is the type of the literal the value would be quoted as.  Returns
+    an empty string if the value shall be passed untyped like a string
+    literal, or None if the value cannot be passed as a parameter.
+    """
+    typ = type(value)
+    if typ is str or typ is unicode:
+        return ''
+    if typ is StdDecimal:
+        if not value.is_finite():
+            return None
+        if str(value).lstrip('-').isdigit():
+            # quoted like an integer literal
+            typ = int
+            value = int(value)
+    if typ is int or typ is long:
+        # the quoted value is negated after its type has been determined
+        if -0x7fffffff <= value <= 0x7fffffff:
+            return 'int4'
+        if -0x7fffffffffffffff <= value <= 0x7fffffffffffffff:
+            return 'int8'
+        return 'numeric'
+    if typ is float:
+        return None if isinf(value) or isnan(value) else 'numeric'
+    if typ is datetime:
+        return 'timestamptz' if value.tzinfo else 'timestamp'
+    if typ is time:
+        return 'timetz' if value.tzinfo else 'time'
+    return _param_types.get(typ)
 
 
 # *** Error Messages ***
@@ -919,6 +1114,17 @@ def _row_factory(names):
         return namedtuple('Row', names)._make
 
 
+def _takes_tuples(row_factory):
+    """Check whether the row factory can be passed tuples instead of lists.
+
+    This is true for the factories of named tuples that are created by
+    _row_factory(), for all other row factories, rows are passed as lists.
+    """
+    cls = getattr(row_factory, '__self__', None)
+    return (isinstance(cls, type) and issubclass(cls, tuple)
+            and getattr(row_factory, '__name__', None) == '_make')
+
+
 def set_row_factory_size(maxsize):
     """Change the size of the namedtuple factory cache.
 
@@ -938,10 +1144,13 @@ class Cursor(object):
         """Create a cursor object for the database connection."""
         self.connection = self._dbcnx = dbcnx
         self._cnx = dbcnx._cnx
+        self._escape_string = self._cnx.escape_string
         self.type_cache = dbcnx.type_cache
         self._src = self._cnx.source()
         # the official attribute for describing the result columns
         self._description = None
+        self._casts = None  # the typecast functions for the columns
+        self._tuple_factory = None  # last row factory that takes tuples
         if self.row_factory is Cursor.row_factory:
             # the row factory needs to be determined dynamically
             self.row_factory = None
@@ -965,64 +1174,155 @@ class Cursor(object):
 
     def _quote(self, value):
         """Quote value depending on its type."""
+        # look up the quote method by the exact type of the value first,
+        # this is much faster than checking the type with isinstance()
+        quote = self._quote_methods.get(type(value))
+        if quote is None:
+            quote = self._get_quote_method(value)
+        return quote(self, value)
+
+    def _get_quote_method(self, value):
+        """Get the quote method for values of other types and subtypes."""
         if value is None:
-            return 'NULL'
+            return Cursor._quote_null
         if isinstance(value, (Hstore, Json)):
-            value = str(value)
+            return Cursor._quote_wrapped
         if isinstance(value, basestring):
             if isinstance(value, Binary):
-                value = self._cnx.escape_bytea(value)
-                if bytes is not str:  # Python >= 3.0
-                    value = value.decode('ascii')
-            else:
-                value = self._cnx.escape_string(value)
-            return "'%s'" % (value,)
+                return Cursor._quote_binary
+            return Cursor._quote_string
         if isinstance(value, float):
-            if isinf(value):
-                return "'-Infinity'" if value < 0 else "'Infinity'"
-            if isnan(value):
-                return "'NaN'"
-            return value
+            return Cursor._quote_float
         if isinstance(value, (int, long, Decimal, Literal)):
-            return value
+            return Cursor._quote_plain
         if isinstance(value, datetime):
-            if value.tzinfo:
-                return "'%s'::timestamptz" % (value,)
-            return "'%s'::timestamp" % (value,)
+            return Cursor._quote_datetime
         if isinstance(value, date):
-            return "'%s'::date" % (value,)
+            return Cursor._quote_date
         if isinstance(value, time):
-            if value.tzinfo:
-                return "'%s'::timetz" % (value,)
-            return "'%s'::time" % value
+            return Cursor._quote_time
         if isinstance(value, timedelta):
-            return "'%s'::interval" % (value,)
+            return Cursor._quote_interval
         if isinstance(value, Uuid):
-            return "'%s'::uuid" % (value,)
+            return Cursor._quote_uuid
         if isinstance(value, list):
-            # Quote value as an ARRAY constructor. This is better than using
-            # an array literal because it carries the information that this is
-            # an array and not a string.  One issue with this syntax is that
-            # you need to add an explicit typecast when passing empty arrays.
-            # The ARRAY keyword is actually only necessary at the top level.
-            if not value:  # exception for empty array
-                return "'{}'"
-            q = self._quote
-            try:
-                return 'ARRAY[%s]' % (','.join(str(q(v)) for v in value),)
-            except UnicodeEncodeError:  # Python 2 with non-ascii values
-                return u'ARRAY[%s]' % (','.join(unicode(q(v)) for v in value),)
+            return Cursor._quote_array
         if isinstance(value, tuple):
-            # Quote as a ROW constructor.  This is better than using a record
-            # literal because it carries the information that this is a record
-            # and not a string.  We don't use the keyword ROW in order to make
-            # this usable with the IN syntax as well.  It is only necessary
-            # when the records has a single column which is not really useful.
-            q = self._quote
-            try:
-                return '(%s)' % (','.join(str(q(v)) for v in value),)
-            except UnicodeEncodeError:  # Python 2 with non-ascii values
-                return u'(%s)' % (','.join(unicode(q(v)) for v in value),)
+            return Cursor._quote_record
+        return Cursor._quote_other
+
+    # noinspection PyUnusedLocal
+    def _quote_null(self, value):
+        """Quote None as NULL."""
+        return 'NULL'
+
+    def _quote_string(self, value):
+        """Quote a string value."""
+        return "'%s'" % (self._escape_string(value),)
+
+    def _quote_binary(self, value):
+        """Quote a binary value."""
+        value = self._cnx.escape_bytea(value)
+        if bytes is not str:  # Python >= 3.0
+            value = value.decode('ascii')
+        return "'%s'" % (value,)
+
+    def _quote_wrapped(self, value):
+        """Quote a value wrapped as Hstore or Json."""
+        return self._quote_string(str(value))
+
+    # noinspection PyMethodMayBeStatic
+    def _quote_float(self, value):
+        """Quote a float value."""
+        if isinf(value):
+            return "'-Infinity'" if value < 0 else "'Infinity'"
+        if isnan(value):
+            return "'NaN'"
+        return value
+
+    # noinspection PyMethodMayBeStatic
+    def _quote_plain(self, value):
+        """Pass a value that does not need quoting."""
+        return value
+
+    # noinspection PyMethodMayBeStatic
+    def _quote_datetime(self, value):
+        """Quote a datetime value."""
+        if value.tzinfo:
+            return "'%s'::timestamptz" % (value,)
+        return "'%s'::timestamp" % (value,)
+
+    # noinspection PyMethodMayBeStatic
+    def _quote_date(self, value):
+        """Quote a date value."""
+        return "'%s'::date" % (value,)
+
+    # noinspection PyMethodMayBeStatic
+    def _quote_time(self, value):
+        """Quote a time value."""
+        if value.tzinfo:
+            return "'%s'::timetz" % (value,)
+        return "'%s'::time" % value
+
+    # noinspection PyMethodMayBeStatic
+    def _quote_interval(self, value):
+        """Quote a timedelta value."""
+        return "'%s'::interval" % (value,)
+
+    # noinspection PyMethodMayBeStatic
+    def _quote_uuid(self, value):
+        """Quote a UUID value."""
+        return "'%s'::uuid" % (value,)
+
+    def _quote_array(self, value):
+        """Quote a list as an ARRAY constructor."""
+        # Quote value as an ARRAY constructor. This is better than using
+        # an array literal because it carries the information that this is
+        # an array and not a string.  One issue with this syntax is that
+        # you need to add an explicit typecast when passing empty arrays.
+        # The ARRAY keyword is actually only necessary at the top level.
+        if not value:  # exception for empty array
+            return "'{}'"
+        return 'ARRAY[%s]' % (self._quote_items(value),)
+
+    def _quote_record(self, value):
+        """Quote a tuple as a ROW constructor."""
+        # Quote as a ROW constructor.  This is better than using a record
+        # literal because it carries the information that this is a record
+        # and not a string.  We don't use the keyword ROW in order to make
+        # this usable with the IN syntax as well.  It is only necessary
+        # when the records has a single column which is not really useful.
+        return '(%s)' % (self._quote_items(value),)
+
+    def _quote_items(self, values):
+        """Quote the items of a list or tuple and join them with commas."""
+        quoted = self._quote_strings(values)
+        if quoted is None:
+            # numbers are not converted to strings by _quote(),
+            # since they can also be used with number placeholders
+            quoted = [q if isinstance(q, basestring) else str(q)
+                      for q in map(self._quote, values)]
+        return ','.join(quoted)
+
+    def _quote_strings(self, values):
+        """Quote a sequence of strings, escaping all of them at once.
+
+        Returns None if not all values are strings or if they cannot be
+        escaped together, then they need to be quoted one by one.
+        """
+        if len(values) < 2 or not all(type(v) is str for v in values):
+            return None
+        sep = _escape_separator
+        joined = sep.join(values)
+        if joined.count(sep) != len(values) - 1:
+            return None  # the separator is contained in some value
+        escaped = self._cnx.escape_string(joined).split(sep)
+        if len(escaped) != len(values):
+            return None  # the escaping has changed some separator
+        return ["'%s'" % (v,) for v in escaped]
+
+    def _quote_other(self, value):
+        """Quote a value using its __pg_repr__() method."""
         try:  # noinspection PyUnresolvedReferences
             value = value.__pg_repr__()
         except AttributeError:
@@ -1032,6 +1332,17 @@ class Cursor(object):
             value = self._quote(value)
         return value
 
+    # quote methods for the most common types of values (exact types only),
+    # values of all other types are handled by _get_quote_method()
+    _quote_methods = {
+        type(None): _quote_null,
+        str: _quote_string, unicode: _quote_string, bytes: _quote_string,
+        float: _quote_float, int: _quote_plain, long: _quote_plain,
+        bool: _quote_plain, StdDecimal: _quote_plain,
+        datetime: _quote_datetime, date: _quote_date, time: _quote_time,
+        timedelta: _quote_interval, Uuid: _quote_uuid,
+        list: _quote_array, tuple: _quote_record}
+
     def _quoteparams(self, string, parameters):
         """Quote parameters.
 
@@ -1046,12 +1357,94 @@ class Cursor(object):
             except (TypeError, ValueError):
                 return string  # silently accept unescaped quotes
         if isinstance(parameters, dict):
-            parameters = _quotedict(parameters)
-            parameters.quote = self._quote
+            parameters = _quotedview(parameters, self._quote)
         else:
             parameters = tuple(map(self._quote, parameters))
         return string % parameters
 
+    def _prepare(self, operation, seq_of_parameters):
+        """Check whether an operation can be run as prepared statement.
+
+        If the operation and all parameters are suitable, the translated
+        operation and the sequence of parameter values that shall be passed
+        to the prepared statement are returned.  Otherwise, None is returned
+        and the parameters need to be quoted as usual.
+        """
+        if not isinstance(seq_of_parameters, (list, tuple)):
+            return None  # we need to check all parameters in advance
+        if len(seq_of_parameters) < 10:
+            return None  # not worth the additional round trips
+        prepared = _prepare_operation(operation)
+        if not prepared:
+            return None
+        parts, indices, names = prepared
+        if names[0] is not None:  # named parameters
+            if not all(isinstance(parameters, dict)
+                       for parameters in seq_of_parameters):
+                return None
+            try:
+                seq_of_values = [[parameters[name] for name in names]
+                                 for parameters in seq_of_parameters]
+            except KeyError:
+                return None
+        else:
+            num_params = len(names)
+            if not all(isinstance(parameters, (list, tuple))
+                       and len(parameters) == num_params
+                       for parameters in seq_of_parameters):
+                return None
+            seq_of_values = seq_of_parameters
+        # the parameters get the same types as the literals they would be
+        # quoted as, so that the operation has the same meaning, and they
+        # must have the same types in all rows, except for NULL values
+        types = [None] * len(names)
+        get_param_type = _get_param_type
+        for values in seq_of_values:
+            for index, value in enumerate(values):
+                if value is None:
+                    continue
+                typ = get_param_type(value)
+                if typ is None:
+                    return None
+                current_typ = types[index]
+                if typ == current_typ:
+                    continue
+                if current_typ is None:
+                    types[index] = typ
+                elif (typ in _numeric_param_types
+                        and current_typ in _numeric_param_types):
+                    # widen the numeric type to cover all values
+                    types[index] = max(
+                        typ, current_typ, key=_numeric_param_types.index)
+                else:
+                    return None
+        casts = ['::pg_catalog.%s' % (typ,) if typ else '' for typ in types]
+        operation = parts[0] + ''.join(
+            '$%d%s%s' % (index + 1, casts[index], part)
+            for index, part in zip(indices, parts[1:]))
+        return operation, seq_of_values
+
+    def _prepare_statement(self, operation, savepoint):
+        """Prepare an operation as the unnamed statement.
+
+        Returns whether the operation could be prepared.  If this is done
+        inside a transaction that was already open, a savepoint must be
+        used, so that the transaction is not aborted when this fails.
+        """
+        query = self._cnx.query
+        if savepoint:
+            query('SAVEPOINT pgdb_prepare')
+        try:
+            self._cnx.prepare('', operation)
+        except DatabaseError:
+            # the operation cannot be prepared, for instance because the
+            # data types of the parameters cannot be determined
+            if savepoint:
+                query('ROLLBACK TO SAVEPOINT pgdb_prepare;'
+                      ' RELEASE SAVEPOINT pgdb_prepare')
+            return False
+        return True
+
     def _make_description(self, info):
         """Make the description tuple for the given field info."""
         name, typ, size, mod = info[1:]
@@ -1075,8 +1468,20 @@ class Cursor(object):
         """Read-only attribute describing the result columns."""
         descr = self._description
         if self._description is True:
-            make = self._make_description
-            descr = [make(info) for info in self._src.listinfo()]
+            listinfo = self._src.listinfo()
+            # the same queries usually return columns with the same names
+            # and types, so we cache the description tuples by field info
+            descriptions = self._dbcnx._descriptions
+            try:
+                descr = list(descriptions[listinfo])
+            except KeyError:
+                # look up all types that are not yet cached with one query
+                self.type_cache.get_types([info[2] for info in listinfo])
+                make = self._make_description
+                descr = [make(info) for info in listinfo]
+                if len(descriptions) >= 1024:
+                    descriptions.clear()
+                descriptions[listinfo] = tuple(descr)
             self._description = descr
         return descr
 
@@ -1120,7 +1525,10 @@ class Cursor(object):
         rowcount = 0
         sql = "BEGIN"
         try:
-            if not self._dbcnx._tnx and not self._dbcnx.autocommit:
+            prepared = self._prepare(operation, seq_of_parameters)
+            begin = not self._dbcnx._tnx and not self._dbcnx.autocommit
+            if begin and (prepared or not isinstance(
+                    operation, (str, unicode))):
                 try:
                     self._src.execute(sql)
                 except DatabaseError:
@@ -1129,14 +1537,62 @@ class Cursor(object):
                     raise _op_error("Can't start transaction")
                 else:
                     self._dbcnx._tnx = True
-            for parameters in seq_of_parameters:
-                sql = operation
-                sql = self._quoteparams(sql, parameters)
-                rows = self._src.execute(sql)
-                if rows:  # true if not DML
-                    rowcount += rows
+                begin = False
+            if prepared:
+                # this must be done after BEGIN has been sent, since any
+                # simple query drops the unnamed prepared statement
+                sql, seq_of_values = prepared
+                savepoint = self._dbcnx._tnx
+                if self._prepare_statement(sql, savepoint):
+                    execute = self._src.execute_prepared
+                    for values in seq_of_values:
+                        rows = execute('', values)
+                        if rows:  # true if not DML
+                            rowcount += rows
+                        else:
+                            self.rowcount = -1
+                    if savepoint:
+                        self._cnx.query('RELEASE SAVEPOINT pgdb_prepare')
                 else:
-                    self.rowcount = -1
+                    prepared = None  # quote the parameters instead
+            if not prepared:
+                if not isinstance(seq_of_parameters, list) or len(
+                        seq_of_parameters) > 1:
+                    # the same strings are often passed many times, so we
+                    # cache them while the connection settings are the same
+                    self._escape_string = lru_cache(1024)(
+                        self._cnx.escape_string)
+                try:
+                    for parameters in seq_of_parameters:
+                        sql = operation
+                        sql = self._quoteparams(sql, parameters)
+                        if begin:
+                            # send BEGIN in the same round trip as the query
+                            sql = "BEGIN;" + sql
+                            self._dbcnx._tnx = True
+                            begin = False
+                            try:
+                                rows = self._src.execute(sql)
+                            except Exception:
+                                # if the query could not be parsed, BEGIN
+                                # has not been executed either
+                                if self._cnx.transaction() == TRANS_IDLE:
+                                    self._dbcnx._tnx = False
+                                raise
+                        else:
+                            rows = self._src.execute(sql)
+                        if rows:  # true if not DML
+                            rowcount += rows
+                        else:
+                            self.rowcount = -1
+                finally:
+                    self._escape_string = self._cnx.escape_string
+                if begin:
+                    # no query has been sent, but a transaction must still
+                    # be started and the result of BEGIN must be set
+                    sql = "BEGIN"
+                    self._src.execute(sql)
+                    self._dbcnx._tnx = True
         except DatabaseError:
             raise  # database provides error message
         except Error as err:
@@ -1152,6 +1608,9 @@ class Cursor(object):
             self.lastrowid = None
             if self.build_row_factory:
                 self.row_factory = self.build_row_factory()
+            # look up the typecast functions for the columns only once here
+            # instead of doing this in every call of the fetch methods
+            self._casts = self.type_cache.get_column_casts(self.coltypes)
         else:
             self.rowcount = rowcount
             self.lastrowid = self._src.oidstatus()
@@ -1184,21 +1643,33 @@ class Cursor(object):
         if keep:
             self.arraysize = size
         try:
-            result = self._src.fetch(size)
+            if self._casts:
+                # the values are casted column by column in the source
+                # object, using the typecast functions that have been looked
+                # up when the query was executed; integers and floats are
+                # parsed natively
+                rows = zip(*self._src.fetch_columnar(size, self._casts))
+            else:
+                # the rows of results without columns cannot be built
+                # from the columns, so these must be fetched row by row
+                rows = self._src.fetch(size)
         except DatabaseError:
             raise
         except Error as err:
             raise _db_error(str(err))
         row_factory = self.row_factory
-        coltypes = self.coltypes
-        if len(result) > 5:
-            # optimize the case where we really fetch many values
-            # by looking up all type casting functions upfront
-            cast_row = self.type_cache.get_row_caster(coltypes)
-            return [row_factory(cast_row(row)) for row in result]
-        cast_value = self.type_cache.typecast
-        return [row_factory([cast_value(value, typ)
-                for typ, value in zip(coltypes, row)]) for row in result]
+        if row_factory is tuple:
+            return list(rows)  # the rows are already tuples
+        if row_factory is list:
+            return list(map(list, rows))
+        # remember the row factory if it takes tuples, so that we do not
+        # need to check this again when fetching rows one by one
+        if row_factory is not self._tuple_factory:
+            if _takes_tuples(row_factory):
+                self._tuple_factory = row_factory
+            else:
+                rows = map(list, rows)
+        return list(map(row_factory, rows))
 
     def callproc(self, procname, parameters=None):
         """Call a stored database procedure with the given name.
@@ -1551,6 +2022,7 @@ class Connection(object):
         self._cnx = cnx  # connection
         self._tnx = False  # transaction state
         self.type_cache = TypeCache(cnx)
+        self._descriptions = {}  # cached descriptions of result columns
         self.cursor_type = Cursor
         self.autocommit = False
         try:
@@ -1676,15 +2148,10 @@ def connect(dsn=None,
     dbuser = ""
     dbpasswd = ""
     dbopt = ""
-    try:
-        params = dsn.split(":")
-        dbhost = params[0]
-        dbname = params[1]
-        dbuser = params[2]
-        dbpasswd = params[3]
-        dbopt = params[4]
-    except (AttributeError, IndexError, TypeError):
-        pass
+    if isinstance(dsn, (str, unicode)):
+        params = dsn.split(":")[:5]
+        params.extend([""] * (5 - len(params)))
+        dbhost, dbname, dbuser, dbpasswd, dbopt = params
 
     # override if necessary
     if user is not None:
@@ -1693,13 +2160,14 @@ def connect(dsn=None,
         dbpasswd = password
     if database is not None:
         dbname = database
-    if host is not None:
-        try:
-            params = host.split(":")
-            dbhost = params[0]
-            dbport = int(params[1])
-        except (AttributeError, IndexError, TypeError, ValueError):
-            pass
+    if isinstance(host, (str, unicode)):
+        params = host.split(":")
+        dbhost = params[0]
+        if len(params) > 1:
+            try:
+                dbport = int(params[1])
+            except ValueError:
+                pass  # ignore an invalid port
 
     # empty host is localhost
     if dbhost == "":
@@ -1744,19 +2212,19 @@ class Type(frozenset):
 
     def __eq__(self, other):
         if isinstance(other, basestring):
-            if other.startswith('_'):
-                other = other[1:]
-            return other in self
-        else:
-            return super(Type, self).__eq__(other)
+            # array types are also equal if their element type is contained
+            return other in self or (
+                other.startswith('_') and other[1:] in self)
+        return frozenset.__eq__(self, other)
 
     def __ne__(self, other):
         if isinstance(other, basestring):
-            if other.startswith('_'):
-                other = other[1:]
-            return other not in self
-        else:
-            return super(Type, self).__ne__(other)
+            return other not in self and not (
+                other.startswith('_') and other[1:] in self)
+        return frozenset.__ne__(self, other)
+
+    # overriding __eq__() would make the class unhashable otherwise
+    __hash__ = frozenset.__hash__
 
 
 class ArrayType:
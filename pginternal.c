@@ -189,6 +189,16 @@ get_col_types(PGresult *result, int nfields)
     return types;
 }
 
+/* Get the value of a hexadecimal digit or -1 if it is not a hex digit. */
+static int
+hex_value(char c)
+{
+    if (c >= '0' && c <= '9') return c - '0';
+    if (c >= 'a' && c <= 'f') return c - 'a' + 10;
+    if (c >= 'A' && c <= 'F') return c - 'A' + 10;
+    return -1;
+}
+
 /* Cast a bytea encoded text based type to a Python object.
    This assumes the text is null-terminated character string. */
 static PyObject *
@@ -199,11 +209,34 @@ cast_bytea_text(char *s)
     size_t str_len;
 
     /* this function should not be called when bytea_escaped is set */
+    if (s[0] == '\\' && s[1] == 'x') {
+        /* the hex format is decoded directly into the bytes object,
+           avoiding the temporary buffer needed by PQunescapeBytea() */
+        char *h = s + 2;
+
+        str_len = strlen(h);
+        if (!(str_len & 1)) {
+            size_t i;
+
+            str_len >>= 1;
+            obj = PyBytes_FromStringAndSize(NULL, (Py_ssize_t) str_len);
+            if (!obj) return NULL;
+            tmp_str = PyBytes_AS_STRING(obj);
+            for (i = 0; i < str_len; ++i, h += 2) {
+                int hi = hex_value(h[0]), lo = hex_value(h[1]);
+
+                if (hi < 0 || lo < 0) break;
+                tmp_str[i] = (char) (hi << 4 | lo);
+            }
+            if (i == str_len) return obj;
+            Py_DECREF(obj); /* not plain hex, let libpq handle this */
+        }
+    }
+
     tmp_str = (char *) PQunescapeBytea((unsigned char*) s, &str_len);
+    if (!tmp_str) return PyErr_NoMemory();
     obj = PyBytes_FromStringAndSize(tmp_str, (Py_ssize_t) str_len);
-    if (tmp_str) {
-        PQfreemem(tmp_str);
-    }
+    PQfreemem(tmp_str);
     return obj;
 }
 
@@ -214,7 +247,6 @@ cast_sized_text(char *s, Py_ssize_t size, int encoding, int type)
 {
     PyObject *obj, *tmp_obj;
     char *tmp_str;
-    size_t str_len;
 
     switch (type) { /* this must be the PyGreSQL internal type */
 
@@ -226,14 +258,9 @@ cast_sized_text(char *s, Py_ssize_t size, int encoding, int type)
                 return PyErr_NoMemory();
             }
             memcpy(tmp_str, s, (size_t) size);
-            s = tmp_str; *(s + size) = '\0';
-            tmp_str = (char *) PQunescapeBytea((unsigned char*) s, &str_len);
-            PyMem_Free(s);
-            if (!tmp_str) return PyErr_NoMemory();
-            obj = PyBytes_FromStringAndSize(tmp_str, (Py_ssize_t) str_len);
-            if (tmp_str) {
-                PQfreemem(tmp_str);
-            }
+            *(tmp_str + size) = '\0';
+            obj = cast_bytea_text(tmp_str);
+            PyMem_Free(tmp_str);
             break;
 
         case PYGRES_JSON:
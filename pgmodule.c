@@ -174,6 +174,9 @@ typedef struct
 #define is_largeObject(v) (PyType(v) == &largeType)
 #endif /* LARGE_OBJECTS */
 
+/* Module functions that are also used internally */
+static PyObject *pg_unescape_bytea(PyObject *self, PyObject *data);
+
 /* Internal functions */
 #include "pginternal.c"
 
@@ -139,6 +139,70 @@ source_close(sourceObject *self, PyObject *noargs)
     return Py_None;
 }
 
+/* Check the result of the last query (internal use only). */
+static PyObject *
+_source_result(sourceObject *self)
+{
+    /* checks result validity */
+    if (!self->result) {
+        PyErr_SetString(PyExc_ValueError, PQerrorMessage(self->pgcnx->cnx));
+        return NULL;
+    }
+
+    /* this may have changed the datestyle, so we reset the date format
+       in order to force fetching it newly when next time requested */
+    self->pgcnx->date_format = date_format; /* this is normally NULL */
+
+    /* checks result status */
+    switch (PQresultStatus(self->result)) {
+        /* query succeeded */
+        case PGRES_TUPLES_OK:   /* DQL: returns None (DB-SIG compliant) */
+            self->result_type = RESULT_DQL;
+            self->max_row = PQntuples(self->result);
+            self->num_fields = PQnfields(self->result);
+            Py_INCREF(Py_None);
+            return Py_None;
+        case PGRES_COMMAND_OK:  /* other requests */
+        case PGRES_COPY_OUT:
+        case PGRES_COPY_IN:
+            {
+                long num_rows;
+                char *tmp;
+
+                tmp = PQcmdTuples(self->result);
+                if (tmp[0]) {
+                    self->result_type = RESULT_DML;
+                    num_rows = atol(tmp);
+                }
+                else {
+                    self->result_type = RESULT_DDL;
+                    num_rows = -1;
+                }
+                return PyInt_FromLong(num_rows);
+            }
+
+        /* query failed */
+        case PGRES_EMPTY_QUERY:
+            PyErr_SetString(PyExc_ValueError, "Empty query");
+            break;
+        case PGRES_BAD_RESPONSE:
+        case PGRES_FATAL_ERROR:
+        case PGRES_NONFATAL_ERROR:
+            set_error(ProgrammingError, "Cannot execute command",
+                self->pgcnx->cnx, self->result);
+            break;
+        default:
+            set_error_msg(InternalError,
+                          "Internal error: unknown result status");
+    }
+
+    /* frees result and returns error */
+    PQclear(self->result);
+    self->result = NULL;
+    self->result_type = RESULT_EMPTY;
+    return NULL;
+}
+
 /* Database query. */
 static char source_execute__doc__[] =
 "execute(sql) -- execute a SQL statement (string)\n\n"
@@ -192,64 +256,113 @@ source_execute(sourceObject *self, PyObject *sql)
     /* we don't need the auxiliary string any more */
     Py_XDECREF(tmp_obj);
 
-    /* checks result validity */
-    if (!self->result) {
-        PyErr_SetString(PyExc_ValueError, PQerrorMessage(self->pgcnx->cnx));
+    return _source_result(self);
+}
+
+/* Execute prepared statement. */
+static char source_execute_prepared__doc__[] =
+"execute_prepared(name, params) -- execute a prepared statement\n\n"
+"You must pass the name (string) of the prepared statement and a\n"
+"sequence with the positional parameters.  On success, this call\n"
+"returns the same as the execute() method.\n";
+
+static PyObject *
+source_execute_prepared(sourceObject *self, PyObject *args)
+{
+    PyObject *param_obj, **str, **s;
+    const char **parms, **p;
+    char *name;
+    int encoding, nparms, i;
+
+    /* checks validity */
+    if (!_check_source_obj(self, CHECK_CNX)) {
         return NULL;
     }
 
-    /* this may have changed the datestyle, so we reset the date format
-       in order to force fetching it newly when next time requested */
-    self->pgcnx->date_format = date_format; /* this is normally NULL */
+    /* reads args */
+    if (!PyArg_ParseTuple(args, "sO", &name, &param_obj)) {
+        PyErr_SetString(PyExc_TypeError,
+                        "Method execute_prepared() takes a string"
+                        " and a sequence as arguments");
+        return NULL;
+    }
 
-    /* checks result status */
-    switch (PQresultStatus(self->result)) {
-        /* query succeeded */
-        case PGRES_TUPLES_OK:   /* DQL: returns None (DB-SIG compliant) */
-            self->result_type = RESULT_DQL;
-            self->max_row = PQntuples(self->result);
-            self->num_fields = PQnfields(self->result);
-            Py_INCREF(Py_None);
-            return Py_None;
-        case PGRES_COMMAND_OK:  /* other requests */
-        case PGRES_COPY_OUT:
-        case PGRES_COPY_IN:
-            {
-                long num_rows;
-                char *tmp;
+    param_obj = PySequence_Fast(param_obj,
+        "Method execute_prepared() expects a sequence as second argument");
+    if (!param_obj) return NULL;
+    nparms = (int) PySequence_Fast_GET_SIZE(param_obj);
+
+    str = (PyObject **) PyMem_Malloc((size_t) (nparms + 1) * sizeof(*str));
+    parms = (const char **) PyMem_Malloc(
+        (size_t) (nparms + 1) * sizeof(*parms));
+    if (!str || !parms) {
+        PyMem_Free((void *) parms); PyMem_Free(str);
+        Py_DECREF(param_obj);
+        return PyErr_NoMemory();
+    }
 
-                tmp = PQcmdTuples(self->result);
-                if (tmp[0]) {
-                    self->result_type = RESULT_DML;
-                    num_rows = atol(tmp);
-                }
-                else {
-                    self->result_type = RESULT_DDL;
-                    num_rows = -1;
+    encoding = PQclientEncoding(self->pgcnx->cnx);
+
+    /* convert the parameters to a list of strings */
+    for (i = 0, s = str, p = parms; i < nparms; ++i, ++p) {
+        PyObject *obj = PySequence_Fast_GET_ITEM(param_obj, i);
+
+        if (obj == Py_None) {
+            *p = NULL;
+        }
+        else if (PyBytes_Check(obj)) {
+            *p = PyBytes_AsString(obj);
+        }
+        else {
+            PyObject *str_obj;
+
+            if (PyUnicode_Check(obj)) {
+                str_obj = get_encoded_string(obj, encoding);
+            }
+            else {
+                str_obj = PyObject_Str(obj);
+                if (str_obj && PyUnicode_Check(str_obj)) {
+                    PyObject *tmp_obj = str_obj;
+
+                    str_obj = get_encoded_string(tmp_obj, encoding);
+                    Py_DECREF(tmp_obj);
                 }
-                return PyInt_FromLong(num_rows);
             }
+            if (!str_obj) {
+                PyMem_Free((void *) parms);
+                while (s != str) { s--; Py_DECREF(*s); }
+                PyMem_Free(str);
+                Py_DECREF(param_obj);
+                return NULL;
+            }
+            *s++ = str_obj;
+            *p = PyBytes_AsString(str_obj);
+        }
+    }
 
-        /* query failed */
-        case PGRES_EMPTY_QUERY:
-            PyErr_SetString(PyExc_ValueError, "Empty query");
-            break;
-        case PGRES_BAD_RESPONSE:
-        case PGRES_FATAL_ERROR:
-        case PGRES_NONFATAL_ERROR:
-            set_error(ProgrammingError, "Cannot execute command",
-                self->pgcnx->cnx, self->result);
-            break;
-        default:
-            set_error_msg(InternalError,
-                          "Internal error: unknown result status");
+    /* frees previous result */
+    if (self->result) {
+        PQclear(self->result);
+        self->result = NULL;
     }
+    self->max_row = 0;
+    self->current_row = 0;
+    self->num_fields = 0;
+    self->encoding = encoding;
 
-    /* frees result and returns error */
-    PQclear(self->result);
-    self->result = NULL;
-    self->result_type = RESULT_EMPTY;
-    return NULL;
+    /* gets result */
+    Py_BEGIN_ALLOW_THREADS
+    self->result = PQexecPrepared(self->pgcnx->cnx, name, nparms,
+        parms, NULL, NULL, 0);
+    Py_END_ALLOW_THREADS
+
+    /* we don't need the parameters any more */
+    PyMem_Free((void *) parms);
+    while (s != str) { s--; Py_DECREF(*s); }
+    PyMem_Free(str);
+    Py_DECREF(param_obj);
+
+    return _source_result(self);
 }
 
 /* Get oid status for last query (valid for INSERTs, 0 for other). */
@@ -275,6 +388,48 @@ source_oidstatus(sourceObject *self, PyObject *noargs)
     return PyInt_FromLong((long) oid);
 }
 
+/* Get a field value of the last result (internal use only). */
+static PyObject *
+_source_getvalue(sourceObject *self, int row, int col, int encoding)
+{
+    PyObject *str;
+
+    if (PQgetisnull(self->result, row, col)) {
+        Py_INCREF(Py_None);
+        str = Py_None;
+    }
+    else {
+        char *s = PQgetvalue(self->result, row, col);
+        Py_ssize_t size = PQgetlength(self->result, row, col);
+#if IS_PY3
+        if (PQfformat(self->result, col) == 0) { /* textual format */
+            str = get_decoded_string(s, size, encoding);
+            if (!str) /* cannot decode */
+                str = PyBytes_FromStringAndSize(s, size);
+        }
+        else
+#endif
+        str = PyBytes_FromStringAndSize(s, size);
+    }
+    return str;
+}
+
+/* Get the number of rows to fetch from last result (internal use only). */
+static long
+_source_fetchsize(sourceObject *self, long size)
+{
+    /* seeks last line */
+    /* limit size to be within the amount of data we actually have */
+    if (size == -1 || (self->max_row - self->current_row) < size) {
+        size = self->max_row - self->current_row;
+    }
+    else if (size < 0) {
+        size = 0;
+    }
+
+    return size;
+}
+
 /* Fetch rows from last result. */
 static char source_fetch__doc__[] =
 "fetch(num) -- return the next num rows from the last result in a list\n\n"
@@ -287,9 +442,7 @@ source_fetch(sourceObject *self, PyObject *args)
     PyObject *res_list;
     int i, k;
     long size;
-#if IS_PY3
     int encoding;
-#endif
 
     /* checks validity */
     if (!_check_source_obj(self, CHECK_RESULT | CHECK_DQL | CHECK_CNX)) {
@@ -304,18 +457,12 @@ source_fetch(sourceObject *self, PyObject *args)
         return NULL;
     }
 
-    /* seeks last line */
-    /* limit size to be within the amount of data we actually have */
-    if (size == -1 || (self->max_row - self->current_row) < size) {
-        size = self->max_row - self->current_row;
-    }
+    size = _source_fetchsize(self, size);
 
     /* allocate list for result */
     if (!(res_list = PyList_New(0))) return NULL;
 
-#if IS_PY3
     encoding = self->encoding;
-#endif
 
     /* builds result */
     for (i = 0, k = self->current_row; i < size; ++i, ++k) {
@@ -327,24 +474,10 @@ source_fetch(sourceObject *self, PyObject *args)
         }
 
         for (j = 0; j < self->num_fields; ++j) {
-            PyObject *str;
+            PyObject *str = _source_getvalue(self, k, j, encoding);
 
-            if (PQgetisnull(self->result, k, j)) {
-                Py_INCREF(Py_None);
-                str = Py_None;
-            }
-            else {
-                char *s = PQgetvalue(self->result, k, j);
-                Py_ssize_t size = PQgetlength(self->result, k, j);
-#if IS_PY3
-                if (PQfformat(self->result, j) == 0) { /* textual format */
-                    str = get_decoded_string(s, size, encoding);
-                    if (!str) /* cannot decode */
-                        str = PyBytes_FromStringAndSize(s, size);
-                }
-                else
-#endif
-                str = PyBytes_FromStringAndSize(s, size);
+            if (!str) {
+                Py_DECREF(rowtuple); Py_DECREF(res_list); return NULL;
             }
             PyTuple_SET_ITEM(rowtuple, j, str);
         }
@@ -359,6 +492,138 @@ source_fetch(sourceObject *self, PyObject *args)
     return res_list;
 }
 
+/* Fetch columns from last result. */
+static char source_fetch_columnar__doc__[] =
+"fetch_columnar(num, casts) -- return the next num rows column by column\n\n"
+"The rows are returned as a list with one list of values per column.\n"
+"If num parameter is omitted arraysize attribute value is used.\n"
+"If size equals -1, all rows are fetched.\n"
+"If casts is given, it must be a sequence with one typecast function\n"
+"or None per column that will be applied to all values that are not\n"
+"NULL.  The types int and float and the function unescape_bytea are\n"
+"applied directly to the data, without creating intermediate strings.\n";
+
+static PyObject *
+source_fetch_columnar(sourceObject *self, PyObject *args)
+{
+    PyObject *res_list, *casts = NULL;
+    int j;
+    long size;
+    int encoding;
+
+    /* checks validity */
+    if (!_check_source_obj(self, CHECK_RESULT | CHECK_DQL | CHECK_CNX)) {
+        return NULL;
+    }
+
+    /* checks args */
+    size = self->arraysize;
+    if (!PyArg_ParseTuple(args, "|lO", &size, &casts)) {
+        PyErr_SetString(PyExc_TypeError,
+                        "fetch_columnar(num, casts), with num"
+                        " (integer, optional) and casts (list, optional)");
+        return NULL;
+    }
+
+    if (casts == Py_None) {
+        casts = NULL;
+    }
+    else if (casts) {
+        if (!(casts = PySequence_Fast(
+            casts, "The casts must be passed as a sequence")))
+        {
+            return NULL;
+        }
+        if (PySequence_Fast_GET_SIZE(casts) != self->num_fields) {
+            PyErr_SetString(PyExc_ValueError,
+                            "The number of casts must match the fields");
+            Py_DECREF(casts); return NULL;
+        }
+    }
+
+    size = _source_fetchsize(self, size);
+
+    /* allocate list for result */
+    if (!(res_list = PyList_New(self->num_fields))) {
+        Py_XDECREF(casts); return NULL;
+    }
+
+    encoding = self->encoding;
+
+    /* builds result */
+    for (j = 0; j < self->num_fields; ++j) {
+        PyObject *col_list, *cast = NULL;
+        int i, k, type = 0;
+
+        if (casts) {
+            cast = PySequence_Fast_GET_ITEM(casts, j);
+            if (cast == Py_None) {
+                cast = NULL;
+            }
+            else if (PQfformat(self->result, j) == 0) { /* textual format */
+                /* cast numbers directly, without creating strings */
+                if (cast == (PyObject *) &PyInt_Type)
+                    type = PYGRES_INT;
+                else if (cast == (PyObject *) &PyLong_Type)
+                    type = PYGRES_LONG;
+                else if (cast == (PyObject *) &PyFloat_Type)
+                    type = PYGRES_FLOAT;
+                else if (PyCFunction_Check(cast) &&
+                         PyCFunction_GET_FUNCTION(cast) ==
+                         (PyCFunction) pg_unescape_bytea)
+                    type = PYGRES_BYTEA;
+            }
+        }
+
+        if (!(col_list = PyList_New(size))) {
+            Py_DECREF(res_list); Py_XDECREF(casts); return NULL;
+        }
+        PyList_SET_ITEM(res_list, j, col_list);
+
+        for (i = 0, k = self->current_row; i < size; ++i, ++k) {
+            PyObject *val;
+
+            if (type && !PQgetisnull(self->result, k, j)) {
+                char *s = PQgetvalue(self->result, k, j);
+
+                if (type == PYGRES_FLOAT) {
+                    double d = PyOS_string_to_double(s, NULL, NULL);
+
+                    val = (d == -1.0 && PyErr_Occurred()) ?
+                        NULL : PyFloat_FromDouble(d);
+                }
+                else if (type == PYGRES_BYTEA) {
+                    val = cast_bytea_text(s);
+                }
+                else if (type == PYGRES_INT) {
+                    val = PyInt_FromString(s, NULL, 10);
+                }
+                else {
+                    val = PyLong_FromString(s, NULL, 10);
+                }
+            }
+            else {
+                val = _source_getvalue(self, k, j, encoding);
+                if (cast && val && val != Py_None) {
+                    PyObject *tmp_obj = val;
+
+                    val = PyObject_CallFunctionObjArgs(cast, tmp_obj, NULL);
+                    Py_DECREF(tmp_obj);
+                }
+            }
+
+            if (!val) {
+                Py_DECREF(res_list); Py_XDECREF(casts); return NULL;
+            }
+            PyList_SET_ITEM(col_list, i, val);
+        }
+    }
+
+    Py_XDECREF(casts);
+    self->current_row += (int) size;
+    return res_list;
+}
+
 /* Change current row (internal wrapper for all "move" methods). */
 static PyObject *
 _source_move(sourceObject *self, int move)
@@ -777,10 +1042,14 @@ static PyMethodDef source_methods[] = {
         METH_NOARGS, source_close__doc__},
     {"execute", (PyCFunction) source_execute,
         METH_O, source_execute__doc__},
+    {"execute_prepared", (PyCFunction) source_execute_prepared,
+        METH_VARARGS, source_execute_prepared__doc__},
     {"oidstatus", (PyCFunction) source_oidstatus,
         METH_NOARGS, source_oidstatus__doc__},
     {"fetch", (PyCFunction) source_fetch,
         METH_VARARGS, source_fetch__doc__},
+    {"fetch_columnar", (PyCFunction) source_fetch_columnar,
+        METH_VARARGS, source_fetch_columnar__doc__},
     {"movefirst", (PyCFunction) source_movefirst,
         METH_NOARGS, source_movefirst__doc__},
     {"movelast", (PyCFunction) source_movelast,
@@ -46,6 +46,26 @@ class PgBitString:
         return "B'{0:b}'".format(self.value)
 
 
+class PreparingConnection:
+    """Connection wrapper recording the prepared statements."""
+
+    def __init__(self, cnx):
+        self.cnx = cnx
+        self.prepared = []
+        self.failed = 0
+
+    def __getattr__(self, name):
+        return getattr(self.cnx, name)
+
+    def prepare(self, name, command):
+        try:
+            self.cnx.prepare(name, command)
+        except pgdb.DatabaseError:
+            self.failed += 1
+            raise
+        self.prepared.append(command)
+
+
 class test_PyGreSQL(dbapi20.DatabaseAPI20Test):
 
     driver = pgdb
@@ -327,12 +347,30 @@ class test_PyGreSQL(dbapi20.DatabaseAPI20Test):
                 self.assertIsNone(d.scale)
             self.assertIsNone(d.null_ok)
 
+    def test_description_cached(self):
+        con = self._connect()
+        try:
+            query = "select 1 as a, 'b'::text as b"
+            cur1 = con.cursor()
+            desc1 = cur1.execute(query).description
+            cur2 = con.cursor()
+            desc2 = cur2.execute(query).description
+            self.assertEqual(desc1, desc2)
+            self.assertIsNot(desc1, desc2)
+            self.assertIs(desc1[0], desc2[0])
+            self.assertIs(desc1[1], desc2[1])
+            desc3 = cur2.execute("select 1 as b").description
+            self.assertEqual(desc3[0].name, 'b')
+            self.assertEqual(desc3[0].type_code, 'int4')
+        finally:
+            con.close()
+
     def test_type_cache_info(self):
         con = self._connect()
         try:
             cur = con.cursor()
             type_cache = con.type_cache
-            self.assertNotIn('numeric', type_cache)
+            self.assertIn('numeric', type_cache)  # preloaded built-in type
             type_info = type_cache['numeric']
             self.assertIn('numeric', type_cache)
             self.assertEqual(type_info, 'numeric')
@@ -381,6 +419,87 @@ class test_PyGreSQL(dbapi20.DatabaseAPI20Test):
         finally:
             con.close()
 
+    def test_type_cache_builtin_types(self):
+        con = self._connect()
+        try:
+            cur = con.cursor()
+            type_cache = con.type_cache
+            for oid in (16, 17, 20, 21, 23, 25, 700, 701, 1043, 1700):
+                self.assertIn(oid, type_cache)
+            builtin_types = [
+                type_cache[key] for key in type_cache if isinstance(key, int)]
+            self.assertGreater(len(builtin_types), 10)
+            for type_info in builtin_types:
+                cur.execute(
+                    "select typname, typlen, typtype, typcategory,"
+                    " typdelim, typrelid from pg_type where oid = %s",
+                    (type_info.oid,))
+                self.assertEqual(cur.fetchone(), (
+                    type_info, type_info.len, type_info.type,
+                    type_info.category, type_info.delim, type_info.relid))
+            cur.close()
+        finally:
+            con.close()
+
+    def test_type_cache_get_types(self):
+
+        class CountingSource:
+            """Source wrapper recording the executed queries."""
+
+            def __init__(self, src):
+                self.src = src
+                self.executed = []
+
+            def __getattr__(self, name):
+                return getattr(self.src, name)
+
+            def execute(self, sql):
+                self.executed.append(sql)
+                return self.src.execute(sql)
+
+        con = self._connect()
+        try:
+            type_cache = con.type_cache
+            src = type_cache._src = CountingSource(type_cache._src)
+            # these types are not looked up in other tests,
+            # so they are not cached by any other connection
+            self.assertNotIn(601, type_cache)
+            self.assertNotIn(604, type_cache)
+            types = type_cache.get_types([601, 23, 604, 601])
+            self.assertEqual(types, ['lseg', 'int4', 'polygon', 'lseg'])
+            # the missing types have been looked up with one query
+            self.assertEqual(len(src.executed), 1)
+            self.assertIn(601, type_cache)
+            self.assertIn('lseg', type_cache)
+            self.assertIn(604, type_cache)
+            self.assertIn('polygon', type_cache)
+            self.assertIs(types[0], type_cache[601])
+            self.assertIs(types[2], type_cache['polygon'])
+            self.assertEqual(types[2].oid, 604)
+            self.assertEqual(type_cache.get_types(['polygon']), ['polygon'])
+            self.assertEqual(len(src.executed), 1)
+            self.assertRaises(KeyError, type_cache.get_types, [601, 1, 604])
+        finally:
+            con.close()
+
+    def test_type_cache_shared_types(self):
+        con1 = self._connect()
+        con2 = self._connect()
+        try:
+            type_cache1 = con1.type_cache
+            type_cache2 = con2.type_cache
+            self.assertIsNot(type_cache1, type_cache2)
+            self.assertNotIn(718, type_cache1)
+            self.assertNotIn(718, type_cache2)
+            circle = type_cache1[718]
+            self.assertEqual(circle, 'circle')
+            self.assertNotIn(718, type_cache2)
+            self.assertIs(type_cache2[718], circle)
+            self.assertIs(type_cache2['circle'], circle)
+        finally:
+            con2.close()
+            con1.close()
+
     def test_type_cache_typecast(self):
         con = self._connect()
         try:
@@ -748,6 +867,20 @@ class test_PyGreSQL(dbapi20.DatabaseAPI20Test):
             con.close()
         self.assertEqual(rows, values)
 
+    def test_select_bytea(self):
+        values = (None, b'', bytes(bytearray(range(256))) * 10)
+        con = self._connect()
+        try:
+            cur = con.cursor()
+            cur.execute("select %s::bytea, %s::bytea, %s::bytea",
+                        [None if v is None else pgdb.Binary(v)
+                         for v in values])
+            row = cur.fetchone()
+        finally:
+            con.close()
+        self.assertEqual(tuple(row), values)
+        self.assertIsInstance(row[1], bytes)
+
     def test_select_array(self):
         values = ([1, 2, 3, None], ['a', 'b', 'c', None])
         con = self._connect()
@@ -759,6 +892,18 @@ class test_PyGreSQL(dbapi20.DatabaseAPI20Test):
             con.close()
         self.assertEqual(row, values)
 
+    def test_select_array_of_strings(self):
+        values = ["it's", 'back\\slash', '"quoted"', '', 'sep\x01\x02\x03']
+        con = self._connect()
+        try:
+            cur = con.cursor()
+            cur.execute("select %s::text[], %s", (values, tuple(values)))
+            row = cur.fetchone()
+        finally:
+            con.close()
+        self.assertEqual(row[0], values)
+        self.assertEqual(row[1], tuple(values))
+
     def test_unicode_list_and_tuple(self):
         value = (u'Käse', u'Würstchen')
         con = self._connect()
@@ -1137,6 +1282,210 @@ class test_PyGreSQL(dbapi20.DatabaseAPI20Test):
         sql = 'select 1'  # cannot be executed after connection is closed
         self.assertRaises(pgdb.OperationalError, cur.execute, sql)
 
+    def test_executemany_with_prepared_statement(self):
+        Decimal = pgdb.decimal_type()
+        table = self.table_prefix + 'booze'
+        values = [(1, "it's", None, Decimal('1.5'), date(2020, 12, 24)),
+                  (2, None, True, Decimal('-2'), None),
+                  (3, '%s', False, None, date(1970, 1, 1))]
+        values.extend((n, str(n), None, None, None) for n in range(4, 11))
+        con = self._connect()
+        try:
+            cnx = con._cnx = PreparingConnection(con._cnx)
+            cur = con.cursor()
+            cur.execute("create table %s (n smallint, t text, b bool,"
+                        " d numeric, dt date)" % table)
+            sql = "insert into %s values (%%s, %%s, %%s, %%s, %%s)" % table
+            cur.executemany(sql, values)
+            self.assertEqual(cur.rowcount, 10)
+            self.assertEqual(cnx.prepared, [
+                "insert into %s values ($1::pg_catalog.int4, $2,"
+                " $3::pg_catalog.bool, $4::pg_catalog.numeric,"
+                " $5::pg_catalog.date)" % table])
+            sql = "update %s set t = %%(t)s || '%%%%' where n = %%(n)s" % table
+            cur.executemany(sql, [dict(n=n, t=t) for n, t in enumerate(
+                'abcdefghij', 1)])
+            self.assertEqual(cur.rowcount, 10)
+            self.assertEqual(len(cnx.prepared), 1)
+            # comments prevent running this as a prepared statement
+            sql = "update %s set b = %%s where n = %%s -- or %%s" % table
+            cur.executemany(sql, [(None, n, n) for n in range(4, 11)]
+                            + [(True, 2, 2), (False, 3, 3), (None, 1, 1)])
+            self.assertEqual(cur.rowcount, 10)
+            sql = "update %s /* %%s */ set dt = %%s where n = %%s" % table
+            cur.executemany(sql, [(n, None, n) for n in range(4, 11)]
+                            + [(2, None, 2)] * 3)
+            self.assertEqual(cur.rowcount, 10)
+            self.assertEqual(len(cnx.prepared), 1)
+            sql = "update %s set n = %%(d)s + 100 where n = %%(d)s" % table
+            cur.executemany(sql, [dict(d=d) for d in range(1, 11)])
+            self.assertEqual(cur.rowcount, 10)
+            self.assertEqual(cnx.prepared[1:], [
+                "update %s set n = $1::pg_catalog.int4 + 100"
+                " where n = $1::pg_catalog.int4" % table])
+            cur.execute("select * from %s order by n limit 3" % table)
+            rows = cur.fetchall()
+        finally:
+            con.close()
+        self.assertEqual(rows, [
+            (101, 'a%', None, Decimal('1.5'), date(2020, 12, 24)),
+            (102, 'b%', True, Decimal('-2'), None),
+            (103, 'c%', False, None, date(1970, 1, 1))])
+
+    def test_executemany_with_untyped_parameters(self):
+        Decimal = pgdb.decimal_type()
+        table = self.table_prefix + 'booze'
+        con = self._connect()
+        try:
+            cnx = con._cnx = PreparingConnection(con._cnx)
+            cur = con.cursor()
+            cur.execute("create table %s (n int, m int)" % table)
+            # string parameters are passed as untyped like literals
+            sql = "insert into %s select %%s, %%s" % table
+            cur.executemany(sql, [(str(n), str(n * n)) for n in range(10)])
+            self.assertEqual(cur.rowcount, 10)
+            self.assertEqual(cnx.prepared, [
+                "insert into %s select $1, $2" % table])
+            self.assertEqual(cnx.failed, 0)
+            # numbers are passed as numeric and rounded by the database
+            sql = "update %s set m = %%s where n = %%s" % table
+            cur.executemany(sql, [(1.5, 0), (2.0, 1), (Decimal('1.5'), 2),
+                                  (Decimal('2.0'), 3), (4, 4), (5, 5),
+                                  (6, 6), (7, 7), (8, 8), (9, 9)])
+            self.assertEqual(cur.rowcount, 10)
+            self.assertEqual(cnx.failed, 0)
+            # the type of this parameter cannot be determined, so the
+            # parameters must be quoted inside the open transaction
+            sql = "delete from %s where %%s is null and n = %%s" % table
+            cur.executemany(sql, [(None, n) for n in range(0, 10, 2)] * 2)
+            self.assertEqual(cur.rowcount, 5)
+            self.assertEqual(cnx.failed, 1)
+            cur.execute("select * from %s order by n" % table)
+            rows = cur.fetchall()
+            con.commit()
+            # after the transaction has been started
+            cur.executemany(sql, [(None, n) for n in range(1, 10, 2)] * 2)
+            self.assertEqual(cur.rowcount, 5)
+            self.assertEqual(cnx.failed, 2)
+            con.rollback()
+            # in autocommit mode
+            con.autocommit = True
+            cur.executemany(sql, [(None, n) for n in range(10)])
+            self.assertEqual(cur.rowcount, 5)
+            self.assertEqual(cnx.failed, 3)
+            cur.execute("select count(*) from %s" % table)
+            self.assertEqual(cur.fetchone()[0], 0)
+            self.assertEqual(len(cnx.prepared), 2)
+        finally:
+            con.close()
+        self.assertEqual(rows, [(1, 2), (3, 2), (5, 5), (7, 7), (9, 9)])
+
+    def test_executemany_after_commit(self):
+        table = self.table_prefix + 'booze'
+        values = [(n, chr(n + 97)) for n in range(10)]
+        con = self._connect()
+        try:
+            cnx = con._cnx = PreparingConnection(con._cnx)
+            cur = con.cursor()
+            cur.execute("create table %s (n smallint, t text)" % table)
+            con.commit()
+            # this starts a new transaction and prepares the operation
+            sql = "insert into %s values (%%s, %%s)" % table
+            cur.executemany(sql, values)
+            self.assertEqual(cur.rowcount, 10)
+            self.assertEqual(len(cnx.prepared), 1)
+            con.rollback()
+            cur.execute("select count(*) from %s" % table)
+            self.assertEqual(cur.fetchone()[0], 0)
+            cur.executemany(sql, values)
+            self.assertEqual(len(cnx.prepared), 2)
+            con.commit()
+            cur.execute("select t from %s order by n" % table)
+            rows = [row[0] for row in cur.fetchall()]
+        finally:
+            cur.execute("drop table %s" % table)
+            con.commit()
+            con.close()
+        self.assertEqual(rows, list('abcdefghij'))
+
+    def test_rollback_after_syntax_error(self):
+        table = self.table_prefix + 'booze'
+        con = self._connect()
+        try:
+            cur = con.cursor()
+            cur.execute("create table %s (n smallint)" % table)
+            con.commit()
+            # the transaction is started together with this query
+            self.assertRaises(pgdb.ProgrammingError, cur.execute, "selct 1")
+            con.rollback()
+            self.assertRaises(pgdb.ProgrammingError, cur.execute, "selct 1")
+            cur.execute("insert into %s values (1)" % table)
+            con.rollback()
+            cur.execute("select count(*) from %s" % table)
+            self.assertEqual(cur.fetchone()[0], 0)
+        finally:
+            con.rollback()
+            cur.execute("drop table %s" % table)
+            con.commit()
+            con.close()
+
+    def test_executemany_with_empty_iterator(self):
+        con = self._connect()
+        try:
+            cur = con.cursor()
+            self.assertIs(cur.executemany(
+                "select %s", (p for p in [])), cur)
+            self.assertIsNone(cur.description)
+            self.assertEqual(cur.rowcount, 0)
+            con.rollback()
+            cur.execute("select 1 union select 2")
+            self.assertEqual(cur.rowcount, 2)
+            con.rollback()
+            self.assertIs(cur.executemany(
+                "select %s", (p for p in [])), cur)
+            self.assertIsNone(cur.description)
+            self.assertEqual(cur.rowcount, 0)
+            self.assertRaises(pgdb.DatabaseError, cur.fetchone)
+        finally:
+            con.close()
+
+    def test_executemany_with_repeated_strings(self):
+
+        class CountingConnection:
+            """Connection wrapper counting the escaped strings."""
+
+            def __init__(self, cnx):
+                self.cnx = cnx
+                self.escaped = []
+
+            def __getattr__(self, name):
+                return getattr(self.cnx, name)
+
+            def escape_string(self, value):
+                self.escaped.append(value)
+                return self.cnx.escape_string(value)
+
+        table = self.table_prefix + 'booze'
+        values = ["it's", 'b', "it's", 'b', "it's"]
+        con = self._connect()
+        try:
+            cnx = con._cnx = CountingConnection(con._cnx)
+            cur = con.cursor()
+            cur.execute("create table %s (n smallint, t text)" % table)
+            # the literal prevents running this as a prepared statement
+            sql = "insert into %s values (%%s, %%s || '!')" % table
+            cur.executemany(sql, enumerate(values))
+            self.assertEqual(cur.rowcount, 5)
+            self.assertEqual(cnx.escaped, ["it's", 'b'])
+            # the escaped strings are not cached beyond executemany()
+            cur.execute(sql, (5, "it's"))
+            self.assertEqual(cnx.escaped, ["it's", 'b', "it's"])
+            cur.execute("select t from %s order by n" % table)
+            rows = [row[0] for row in cur.fetchall()]
+        finally:
+            con.close()
+        self.assertEqual(rows, [v + '!' for v in values + ["it's"]])
+
     def test_fetchall_with_various_sizes(self):
         # we test this because there are optimizations based on result size
         con = self._connect()
@@ -1161,6 +1510,51 @@ class test_PyGreSQL(dbapi20.DatabaseAPI20Test):
         finally:
             con.close()
 
+    def test_fetch_rows_without_columns(self):
+        con = self._connect()
+        try:
+            cur = con.cursor()
+            cur.execute('select from generate_series(1, 5)')
+            self.assertEqual(cur.rowcount, 5)
+            self.assertEqual(cur.description, [])
+            res = cur.fetchmany(2)
+            self.assertEqual(res, [(), ()])
+            res = cur.fetchone()
+            self.assertEqual(res, ())
+            res = cur.fetchall()
+            self.assertEqual(res, [(), ()])
+            res = cur.fetchall()
+            self.assertEqual(res, [])
+            cur.row_factory = list
+            cur.execute('select from generate_series(1, 3)')
+            res = cur.fetchall()
+            self.assertEqual(res, [[], [], []])
+        finally:
+            con.close()
+
+    def test_fetchmany_with_null_values(self):
+        con = self._connect()
+        try:
+            cur = con.cursor()
+            cur.execute(
+                'select case when n %% 2 = 0 then n end as n,'
+                ' case when n %% 3 = 0 then n::text end as s,'
+                ' case when n %% 5 = 0 then n %% 2 = 1 end as b'
+                ' from generate_series(1, 10) as s(n)')
+            res = cur.fetchmany(4)
+            self.assertEqual(res, [
+                (None, None, None), (2, None, None),
+                (None, '3', None), (4, None, None)])
+            self.assertIsInstance(res[0], tuple)
+            self.assertEqual(res[3]._fields, ('n', 's', 'b'))
+            res = cur.fetchmany(-1)
+            self.assertEqual(res, [
+                (None, None, True), (6, '6', None), (None, None, None),
+                (8, None, None), (None, '9', None), (10, None, False)])
+            self.assertEqual(cur.fetchmany(4), [])
+        finally:
+            con.close()
+
     def test_fetchmany_with_keep(self):
         con = self._connect()
         try:
@@ -1326,6 +1720,9 @@ class test_PyGreSQL(dbapi20.DatabaseAPI20Test):
         self.assertTrue(pgdb.NUMBER >= pgdb.INTEGER)
         self.assertTrue(pgdb.TIME <= pgdb.DATETIME)
         self.assertTrue(pgdb.DATETIME >= pgdb.DATE)
+        self.assertEqual('_int4', pgdb.INTEGER)
+        self.assertNotEqual('_text', pgdb.INTEGER)
+        self.assertIn(pgdb.NUMBER, {pgdb.NUMBER})
         self.assertEqual(pgdb.ARRAY, pgdb.ARRAY)
         self.assertNotEqual(pgdb.ARRAY, pgdb.STRING)
         self.assertEqual('_char', pgdb.ARRAY)
@@ -1345,6 +1742,21 @@ class test_PyGreSQL(dbapi20.DatabaseAPI20Test):
         row = cur.fetchone()
         self.assertEqual(row, data)
 
+    def test_list_and_tuple_as_row_factory(self):
+        con = self._connect()
+        cur = con.cursor()
+        query = "select 1, 'a' union select 2, 'b' order by 1"
+        cur.build_row_factory = lambda: list  # noqa: E731
+        cur.execute(query)
+        rows = cur.fetchall()
+        self.assertEqual(rows, [[1, 'a'], [2, 'b']])
+        self.assertIsInstance(rows[0], list)
+        cur.build_row_factory = lambda: tuple  # noqa: E731
+        cur.execute(query)
+        rows = cur.fetchall()
+        self.assertEqual(rows, [(1, 'a'), (2, 'b')])
+        self.assertIs(type(rows[0]), tuple)
+
     def test_set_row_factory_size(self):
         try:
             from functools import lru_cache